@@ -1,6 +1,7 @@
 import gradio as gr
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 
 from src.pdf_processor import PDFProcessor
 from src.rag_engine import RAGEngine
@@ -17,32 +18,46 @@ rag_engine = RAGEngine()
 # Core Functions
 # -------------------------------------------------
 
+def _extract_and_chunk(path):
+    """Worker-side: parse one PDF and chunk it (runs in a subprocess)."""
+    text = pdf_processor.extract_text_from_pdf(path)
+    chunks = pdf_processor.chunk_text(text)
+    return os.path.basename(path), chunks
+
+
 def process_pdfs(files, processed_files):
     if not files:
         return processed_files, "⚠️ No files uploaded."
 
     status = "🔄 Processing PDFs...\n"
 
+    dest_paths = []
     for file in files:
         filename = os.path.basename(file.name)
         dest_path = os.path.join("data/esg_reports", filename)
 
         # Gradio files already exist on disk
         shutil.copy(file.name, dest_path)
-
-        text = pdf_processor.extract_text_from_pdf(dest_path)
-        chunks = pdf_processor.chunk_text(text)
-
-        metadatas = [
+        dest_paths.append(dest_path)
+
+    # Parse/chunk the PDFs across cores, then index everything in one
+    # batched add_documents call
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        results = list(ex.map(_extract_and_chunk, dest_paths))
+
+    all_chunks = []
+    all_metadatas = []
+    for filename, chunks in results:
+        all_chunks.extend(chunks)
+        all_metadatas.extend(
             {"source": filename, "chunk": i}
             for i in range(len(chunks))
-        ]
-
-        rag_engine.add_documents(chunks, metadatas)
+        )
         processed_files.append(filename)
-
         status += f"✅ {filename} processed\n"
 
+    rag_engine.add_documents(all_chunks, all_metadatas)
+
     return processed_files, status
 
 
@@ -55,16 +70,12 @@ def answer_question(question, processed_files):
 
     result = rag_engine.query(question, k=4)
 
-    # Format sources nicely
-    sources_md = ""
-    for i, doc in enumerate(result["source_documents"]):
-        sources_md += f"""
-**Source {i+1}: {doc.metadata.get('source', 'Unknown')}**
-
-{doc.page_content[:500]}...
-
----
-"""
+    # Format sources nicely - single join, no repeated string growth
+    sources_md = "\n---\n".join(
+        f"\n**Source {i+1}: {doc.metadata.get('source', 'Unknown')}**\n\n"
+        f"{doc.page_content[:500]}...\n"
+        for i, doc in enumerate(result["source_documents"])
+    )
 
     return result["answer"], sources_md
 
@@ -1,204 +1,237 @@
-# modules 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
-
-import os 
-import json 
-from dotenv import load_dotenv
-
-# loading env vals 
-load_dotenv()
-
-# ESG Analyzer class 
-
-class ESGAnalyzer:
-    """_summary_
-    Analyzes ESG reports for metrics and greenwashing.
-    """
-    
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model = "gemini-2.5-flash",
-            temperature = 0.175   
-        )
-    
-    
-    def _validate_metrics(self, metrics: dict) -> dict:
-        """Ensure metrics have proper structure with null values for missing data."""
-        
-        # Template for expected structure
-        template = {
-            'environmental': {
-                'scope_1_emissions': None,
-                'scope_2_emissions': None,
-                'scope_3_emissions': None,
-                'renewable_energy_percentage': None,
-                'water_usage': None,
-                'waste_recycled_percentage': None
-            },
-            'social': {
-                'women_in_workforce_percentage': None,
-                'women_in_leadership_percentage': None,
-                'board_diversity_percentage': None,
-                'safety_incident_rate': None,
-                'employee_training_hours': None
-            },
-            'governance': {
-                'independent_directors_percentage': None,
-                'board_size': None,
-                'esg_committee_exists': None,
-                'ethics_violations_reported': None
-            }
-        }
-        
-        # Merge extracted metrics with template
-        for category in template:
-            if category not in metrics:
-                metrics[category] = template[category]
-            else:
-                for metric in template[category]:
-                    if metric not in metrics[category]:
-                        metrics[category][metric] = None
-        
-        return metrics
-    
-    
-    def _get_empty_metrics(self) -> dict:
-        """Return empty metrics structure when extraction fails."""
-        return {
-            'environmental': {
-                'scope_1_emissions': None,
-                'scope_2_emissions': None,
-                'scope_3_emissions': None,
-                'renewable_energy_percentage': None,
-                'water_usage': None,
-                'waste_recycled_percentage': None
-            },
-            'social': {
-                'women_in_workforce_percentage': None,
-                'women_in_leadership_percentage': None,
-                'board_diversity_percentage': None,
-                'safety_incident_rate': None,
-                'employee_training_hours': None
-            },
-            'governance': {
-                'independent_directors_percentage': None,
-                'board_size': None,
-                'esg_committee_exists': None,
-                'ethics_violations_reported': None
-            }
-        }
-        
-    
-    def extract_metrics(self, text: str) -> dict:
-        """_summary_
-        Extract structured ESG metrics from the text.
-        
-        Args:
-            text (str): Relevant sections of text to analyze 
-
-        Returns:
-            dict: Dictionary of extracted metrics 
-        """
-        
-        # Load prompt template 
-        with open('.\prompts\sample_metric.txt', 'r') as file:
-            template = file.read()
-        
-        prompt = template.replace('{text}', text[:10000])
-        
-        try:
-            response = self.llm.invoke(prompt).content.strip()
-            metrics = json.loads(response.strip())
-            return metrics 
-        except Exception as e:
-            print(f"Error extracting metrics: {e}")
-            return {"error" : str(e)}
-        
-    
-    def detect_greenwashing(self, statement: str) -> dict:
-        """_summary_
-        Analyze a statememt for greenwashing
-        
-        Args:
-            statement (str): Statements extracted form the Corporate Sustainability Report 
-
-        Returns:
-            dict: Dictionary showing the greenwashing analysis report 
-        """
-        
-        # Load prompt template 
-        with open('.\prompts\sample_gwd.txt', 'r') as file:
-            template = file.read()
-        
-        prompt = template.replace('{statement}', statement)
-        
-        try:
-            response = self.llm.invoke(prompt).content.strip()   
-            print("\n\nVerifying the output of gw function :")
-            print(response, "\n\n\n")
-            analysis = json.loads(response.strip())
-            return analysis 
-        except Exception as e:
-            print(f"Error detecting greenwashing : {e}")
-            return {"error" : str(e)}
-        
-        
-    def analyze_commitments(self, text: str) -> dict:
-        """_summary_
-        Extract and analyze the sustainability claims made in the report 
-        
-        Args:
-            text (str): Claims made 
-
-        Returns:
-            dict: Returns a dictionary of commitments and activities with target dates, progress and current status.s
-        """
-        
-        # Load prompt template 
-        with open('.\prompts\sample_commits.txt', 'r') as file:
-            template = file.read()
-        
-        prompt = template.replace('{text}', text)
-        
-        
-        try:
-            response = self.llm.invoke(prompt).content.strip()
-            claim_report = json.loads(response.strip())
-            return claim_report
-        except Exception as e:
-            print(f"Error analyzing commitments : {e}")
-            return {"error" : str(e)}
-    
-        
-# Test the analyzer 
-if __name__ == "__main__":
-    analyzer = ESGAnalyzer()
-    
-    # Test metric extraction 
-    print("Testing metric extraction...")
-    sample_text = """
-    In 2023, our Scope 1 and 2 emissions totaled 450,000 tons of CO2 equivalent,
-    representing a 25% \\reduction from our 2020 baseline. We achieved 65% \\renewable
-    energy usage across all operations. Our workforce is 42% women, with 35% women
-    in leadership roles. The board consists of 12 directors, of which 50% \\are independent.
-    """
-    
-    metrics = analyzer.extract_metrics(sample_text)
-    print(json.dumps(metrics, indent=2))
-    print("\n\n\n", "=" * 100, "\n\n")
-    
-    
-    # Test greenwashing detection
-    print("\n\nTesting greenwashing detection...")
-    test_statements = [
-        "We are committed to exploring sustainable solutions for a better tomorrow.",
-        "We will reduce Scope 1 and 2 emissions by 50% by 2030, based on our 2020 baseline of 800,000 tons CO2e."
-    ]   
-    
-    for statement in test_statements:
-        print(f"\nStatement: {statement}\n")
-        result = analyzer.detect_greenwashing(statement)
-        print("\n\n\n", "=" * 100, "\n\n")
-        print(f"Greenwashing Score: {result.get('greenwashing_score', 'N/A')}/10")
+# modules
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_groq import ChatGroq
+
+import os
+import orjson
+import hashlib
+from pathlib import Path
+from dotenv import load_dotenv
+
+# loading env vals
+load_dotenv()
+
+# Cache of raw LLM responses keyed by prompt hash - a repeated analysis
+# (dashboard re-runs, demos) skips the Gemini roundtrip entirely
+CACHE_DIR = os.path.join("data", "llm_cache")
+
+# Prompt templates live next to src/, resolved relative to this file so
+# the analyzer works regardless of the current working directory
+PROMPT_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+# ESG Analyzer class 
+
+class ESGAnalyzer:
+    """_summary_
+    Analyzes ESG reports for metrics and greenwashing.
+    """
+    
+    def __init__(self):
+        self.llm = ChatGoogleGenerativeAI(
+            model = "gemini-2.5-flash",
+            temperature = 0.175
+        )
+
+        # Read each prompt template once instead of hitting disk per call,
+        # and pre-split at the placeholder so building a prompt is a single
+        # concatenation rather than a str.replace scan of the whole template
+        self._metric_pre, self._metric_post = (
+            (PROMPT_DIR / "sample_metric.txt").read_text().split('{text}')
+        )
+        self._gwd_pre, self._gwd_post = (
+            (PROMPT_DIR / "sample_gwd.txt").read_text().split('{statement}')
+        )
+        self._commits_pre, self._commits_post = (
+            (PROMPT_DIR / "sample_commits.txt").read_text().split('{text}')
+        )
+    
+    
+    def _cached_invoke(self, prompt: str) -> str:
+        """Invoke the LLM, reusing a cached response for identical prompts."""
+
+        h = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+        cache_path = os.path.join(CACHE_DIR, f"{h}.json")
+
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r') as file:
+                return file.read()
+
+        response = self.llm.invoke(prompt).content
+
+        # Atomic write, so a crash mid-write never leaves a bad cache entry
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w') as file:
+            file.write(response)
+        os.replace(tmp_path, cache_path)
+
+        return response
+
+
+    def _validate_metrics(self, metrics: dict) -> dict:
+        """Ensure metrics have proper structure with null values for missing data."""
+        
+        # Template for expected structure
+        template = {
+            'environmental': {
+                'scope_1_emissions': None,
+                'scope_2_emissions': None,
+                'scope_3_emissions': None,
+                'renewable_energy_percentage': None,
+                'water_usage': None,
+                'waste_recycled_percentage': None
+            },
+            'social': {
+                'women_in_workforce_percentage': None,
+                'women_in_leadership_percentage': None,
+                'board_diversity_percentage': None,
+                'safety_incident_rate': None,
+                'employee_training_hours': None
+            },
+            'governance': {
+                'independent_directors_percentage': None,
+                'board_size': None,
+                'esg_committee_exists': None,
+                'ethics_violations_reported': None
+            }
+        }
+        
+        # Merge extracted metrics with template
+        for category in template:
+            if category not in metrics:
+                metrics[category] = template[category]
+            else:
+                for metric in template[category]:
+                    if metric not in metrics[category]:
+                        metrics[category][metric] = None
+        
+        return metrics
+    
+    
+    def _get_empty_metrics(self) -> dict:
+        """Return empty metrics structure when extraction fails."""
+        return {
+            'environmental': {
+                'scope_1_emissions': None,
+                'scope_2_emissions': None,
+                'scope_3_emissions': None,
+                'renewable_energy_percentage': None,
+                'water_usage': None,
+                'waste_recycled_percentage': None
+            },
+            'social': {
+                'women_in_workforce_percentage': None,
+                'women_in_leadership_percentage': None,
+                'board_diversity_percentage': None,
+                'safety_incident_rate': None,
+                'employee_training_hours': None
+            },
+            'governance': {
+                'independent_directors_percentage': None,
+                'board_size': None,
+                'esg_committee_exists': None,
+                'ethics_violations_reported': None
+            }
+        }
+        
+    
+    def extract_metrics(self, text: str) -> dict:
+        """_summary_
+        Extract structured ESG metrics from the text.
+        
+        Args:
+            text (str): Relevant sections of text to analyze 
+
+        Returns:
+            dict: Dictionary of extracted metrics 
+        """
+        
+        prompt = f"{self._metric_pre}{text[:10000]}{self._metric_post}"
+        
+        try:
+            response = self._cached_invoke(prompt).strip()
+            metrics = orjson.loads(response)
+            return metrics 
+        except Exception as e:
+            print(f"Error extracting metrics: {e}")
+            return {"error" : str(e)}
+        
+    
+    def detect_greenwashing(self, statement: str) -> dict:
+        """_summary_
+        Analyze a statememt for greenwashing
+        
+        Args:
+            statement (str): Statements extracted form the Corporate Sustainability Report 
+
+        Returns:
+            dict: Dictionary showing the greenwashing analysis report 
+        """
+        
+        prompt = f"{self._gwd_pre}{statement}{self._gwd_post}"
+        
+        try:
+            response = self._cached_invoke(prompt).strip()
+            print("\n\nVerifying the output of gw function :")
+            print(response, "\n\n\n")
+            analysis = orjson.loads(response)
+            return analysis 
+        except Exception as e:
+            print(f"Error detecting greenwashing : {e}")
+            return {"error" : str(e)}
+        
+        
+    def analyze_commitments(self, text: str) -> dict:
+        """_summary_
+        Extract and analyze the sustainability claims made in the report 
+        
+        Args:
+            text (str): Claims made 
+
+        Returns:
+            dict: Returns a dictionary of commitments and activities with target dates, progress and current status.s
+        """
+        
+        prompt = f"{self._commits_pre}{text}{self._commits_post}"
+
+
+        try:
+            response = self.llm.invoke(prompt).content.strip()
+            claim_report = orjson.loads(response)
+            return claim_report
+        except Exception as e:
+            print(f"Error analyzing commitments : {e}")
+            return {"error" : str(e)}
+    
+        
+# Test the analyzer 
+if __name__ == "__main__":
+    analyzer = ESGAnalyzer()
+    
+    # Test metric extraction 
+    print("Testing metric extraction...")
+    sample_text = """
+    In 2023, our Scope 1 and 2 emissions totaled 450,000 tons of CO2 equivalent,
+    representing a 25% \\reduction from our 2020 baseline. We achieved 65% \\renewable
+    energy usage across all operations. Our workforce is 42% women, with 35% women
+    in leadership roles. The board consists of 12 directors, of which 50% \\are independent.
+    """
+    
+    metrics = analyzer.extract_metrics(sample_text)
+    print(orjson.dumps(metrics, option=orjson.OPT_INDENT_2).decode())
+    print("\n\n\n", "=" * 100, "\n\n")
+    
+    
+    # Test greenwashing detection
+    print("\n\nTesting greenwashing detection...")
+    test_statements = [
+        "We are committed to exploring sustainable solutions for a better tomorrow.",
+        "We will reduce Scope 1 and 2 emissions by 50% by 2030, based on our 2020 baseline of 800,000 tons CO2e."
+    ]   
+    
+    for statement in test_statements:
+        print(f"\nStatement: {statement}\n")
+        result = analyzer.detect_greenwashing(statement)
+        print("\n\n\n", "=" * 100, "\n\n")
+        print(f"Greenwashing Score: {result.get('greenwashing_score', 'N/A')}/10")
         print(f"Verdict: {result.get('verdict', 'N/A')}")
\ No newline at end of file
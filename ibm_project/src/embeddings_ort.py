@@ -0,0 +1,87 @@
+# modules
+
+import os
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    HAS_ORT = True
+except ImportError:
+    HAS_ORT = False
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+QUANTIZED_FILE = "model_quantized.onnx"
+
+
+class ORTMiniLMEmbeddings(Embeddings):
+    """
+    MiniLM sentence embeddings served through ONNX Runtime with dynamic
+    INT8 quantization. Same vectors as the PyTorch model (near-zero
+    precision loss) but ~2-3x faster on AVX-512 CPUs.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, cache_dir: str = "data/onnx_minilm",
+                 batch_size: int = 32):
+        if not HAS_ORT:
+            raise ImportError(
+                "optimum[onnxruntime] is required for ORTMiniLMEmbeddings"
+            )
+
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+
+        # Export + quantize once, then reuse the cached ONNX file
+        if not os.path.exists(os.path.join(cache_dir, QUANTIZED_FILE)):
+            print("Exporting embedding model to ONNX (one-time setup) ...")
+            model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            model.save_pretrained(cache_dir)
+
+            quantizer = ORTQuantizer.from_pretrained(cache_dir)
+            quantizer.quantize(
+                save_dir=cache_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(
+                    is_static=False, per_channel=False
+                )
+            )
+
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            cache_dir, file_name=QUANTIZED_FILE
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=256,
+            return_tensors="np"
+        )
+
+        outputs = self.model(**encoded)
+        token_embeddings = outputs.last_hidden_state
+
+        # Mean-pool over real tokens, then L2-normalize
+        mask = np.expand_dims(encoded["attention_mask"], -1).astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        embeddings = summed / counts
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.clip(norms, 1e-9, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # One session.run per batch instead of per chunk - amortizes the
+        # Python/C transition and keeps the SIMD kernels fed
+        out = []
+        for i in range(0, len(texts), self.batch_size):
+            out.extend(self._encode(texts[i:i + self.batch_size]).tolist())
+        return out
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0].tolist()
@@ -0,0 +1,48 @@
+# modules
+
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+from sentence_transformers import SentenceTransformer
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# One model per process - the weights are the expensive part
+_MODELS = {}
+
+
+def _get_model(model_name: str, device: str = None) -> SentenceTransformer:
+    key = (model_name, device)
+    if key not in _MODELS:
+        _MODELS[key] = SentenceTransformer(model_name, device=device)
+    return _MODELS[key]
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """
+    Thin wrapper calling SentenceTransformer.encode directly, skipping the
+    LangChain HuggingFaceEmbeddings adapter overhead. Batched, normalized
+    output so inner-product search needs no extra pass.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, batch_size: int = 64,
+                 device: str = None):
+        self.model = _get_model(model_name, device)
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.encode(
+            [text],
+            show_progress_bar=False,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        )[0].tolist()
@@ -1,10 +1,64 @@
-# modules 
+# modules
 
 import fitz
-import os 
+import os
+import numpy as np
 from typing import List, Dict
 
-# PDF processor class 
+try:
+    from numba import njit
+except ImportError:  # fall back to the interpreted version
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True)
+def _chunk_bounds(buf, chunk_size, overlap):
+    """
+    Scan a utf-8 byte buffer and return (start, end) pairs for overlapping
+    chunks, breaking at the last '.' or newline past half the chunk size.
+    Pure byte arithmetic, so Numba compiles it to a tight native loop.
+    """
+    n = buf.size
+
+    # worst-case chunk step, for pre-sizing the output arrays
+    min_step = chunk_size // 2 + 1 - overlap
+    if min_step < 1:
+        min_step = 1
+    max_chunks = n // min_step + 2
+
+    starts = np.empty(max_chunks, dtype=np.int64)
+    ends = np.empty(max_chunks, dtype=np.int64)
+    count = 0
+
+    start = 0
+    while start < n:
+        finish = start + chunk_size
+
+        if finish < n:
+            # Try to break at sentence boundary: last '.' (0x2E) or '\n' (0x0A)
+            break_point = -1
+            for i in range(finish - 1, start - 1, -1):
+                c = buf[i]
+                if c == 0x2E or c == 0x0A:
+                    break_point = i - start
+                    break
+
+            if break_point > chunk_size * 0.5:
+                finish = start + break_point + 1
+
+        starts[count] = start
+        ends[count] = finish if finish < n else n
+        count += 1
+        # step on the unclamped finish, exactly like the original loop
+        start = finish - overlap
+
+    return starts[:count], ends[:count]
+
+
+# PDF processor class
 
 class PDFProcessor:
     """
@@ -26,19 +80,24 @@ class PDFProcessor:
         """
         
         try:
-            # Open the pdf 
-            doc = fitz.open(pdf_path)
-            text = ""
-            page_cnt = len(doc)
-            
-            # Extract text from each page 
+            # Open the pdf
+            doc = fitz.open(pdf_path, filetype="pdf")
+            parts = []
+            page_cnt = doc.page_count
+
+            # Extract text from each page. Collect into a list and join once
+            # (repeated += on a str is O(n^2) in total text length), and skip
+            # image extraction which plain text never needs.
             for pg_no, page in enumerate(doc, 1):
-                text += f"\n---- Page {pg_no} ----\n"
-                text += page.get_text()
-                
+                parts.append(f"\n---- Page {pg_no} ----\n")
+                parts.append(page.get_text(
+                    "text",
+                    flags=fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_IMAGES
+                ))
+
             doc.close()
-            return text 
-        
+            return "".join(parts)
+
         except Exception as e:
             print(f"Error processing {pdf_path} : {str(e)}")
             return ""
@@ -56,28 +115,20 @@ class PDFProcessor:
             List[str]: List of chunks 
         """
         
-        chunks = []
-        start = 0 
-        
-        while start < len(text):
-            finish = start + chunk_size 
-            chunk = text[start:finish]
-            
-            # Try to break at sentence boundary 
-            if finish < len(text):
-                last_period = chunk.rfind(".")
-                last_newline = chunk.rfind("\n")
-                break_point = max(last_period, last_newline)
-                
-                if break_point > chunk_size * 0.5:
-                    chunk = chunk[:break_point + 1]
-                    finish = start + break_point + 1
-                    
-            chunks.append(chunk.strip())
-            start = finish - overlap
-            
-        return chunks 
-    
+        if not text:
+            return []
+
+        # Do the boundary scan on a byte view (JIT-compiled), then
+        # materialize the substrings once at the end
+        raw = text.encode("utf-8")
+        buf = np.frombuffer(raw, dtype=np.uint8)
+        starts, ends = _chunk_bounds(buf, chunk_size, overlap)
+
+        return [
+            raw[s:e].decode("utf-8", errors="ignore").strip()
+            for s, e in zip(starts, ends)
+        ]
+
     
     def extract_metadata(self, pdf_path: str) ->  Dict:
         """_summary_
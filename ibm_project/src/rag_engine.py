@@ -1,11 +1,16 @@
 import os
+import pickle
+import sqlite3
+import hashlib
+from collections import OrderedDict
 from dotenv import load_dotenv
 
 # 1. Corrected Modern Imports (2026 Standards)
+import faiss
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_groq import ChatGroq
 
@@ -13,63 +18,204 @@ from langchain_groq import ChatGroq
 from langchain_classic.chains import create_retrieval_chain
 from langchain_classic.chains.combine_documents import create_stuff_documents_chain
 
+try:
+    from src import embeddings_ort, embeddings_st
+except ImportError:  # when running this file directly from src/
+    import embeddings_ort
+    import embeddings_st
+
 load_dotenv()
 
+# FAISS index parameters
+EMBEDDING_DIM = 384          # all-MiniLM-L6-v2 output size
+HNSW_M = 32                  # neighbours per node in the HNSW graph
+HNSW_EF_CONSTRUCTION = 200   # build-time search width
+HNSW_EF_SEARCH = 64          # query-time search width (recall knob)
+
+# Past this corpus size, swap HNSW for IVFPQ: 16-byte codes instead of
+# 1536-byte vectors, so search stays cache-resident on big archives
+IVFPQ_PROMOTE_AT = 50_000
+IVFPQ_NLIST = 1024           # coarse clusters
+IVFPQ_M = 16                 # sub-quantizers (16 bytes per vector)
+IVFPQ_NBITS = 8
+IVFPQ_NPROBE = 16            # clusters probed per query (recall knob)
+IVFPQ_TRAIN_SAMPLE = 200_000
+
+QUERY_CACHE_SIZE = 256       # recently answered (question, k) pairs
+
+
+def _cuda_available() -> bool:
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
 class RAGEngine:
     """
-    RAG System for ESG report analysis 
+    RAG System for ESG report analysis
     """
-    
-    def __init__(self, persist_directory: str = "data/chromadb"):
-        # Embeddings 
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
-        
+
+    def __init__(self, persist_directory: str = "data/faiss_index"):
+        # Embeddings: MiniLM is compute-bound matmul, so prefer a GPU when
+        # one is visible (bigger batches keep it fed); on CPU prefer the
+        # INT8 ONNX path, and fall back to SentenceTransformer directly
+        if _cuda_available():
+            self.embeddings = embeddings_st.SentenceTransformerEmbeddings(
+                device="cuda", batch_size=128
+            )
+        elif embeddings_ort.HAS_ORT:
+            self.embeddings = embeddings_ort.ORTMiniLMEmbeddings()
+        else:
+            self.embeddings = embeddings_st.SentenceTransformerEmbeddings()
+
         self.persist_directory = persist_directory
-        self.vectorstore = None 
-        
-        # Initialize Groq 
+
+        # HNSW does approximate nearest-neighbour search in ~log time,
+        # instead of a brute-force scan over every stored chunk
+        index = faiss.IndexHNSWFlat(EMBEDDING_DIM, HNSW_M)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+
+        self.vectorstore = FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore({}),
+            index_to_docstore_id={}
+        )
+
+        # Initialize Groq
         self.llm = ChatGoogleGenerativeAI(
             model = "gemini-2.5-flash",
             temperature=0.15
         )
-        
+
+        # LCEL chains are static per retrieval depth, so build each once
+        # and reuse across queries (keyed on k)
+        self._chains = {}
+
+        # LRU of full query results - repeated questions (demos, tests)
+        # skip both the FAISS search and the LLM call
+        self._qcache = OrderedDict()
+
     def add_documents(self, texts: list, metadatas: list = None):
         print(f"Adding {len(texts)} documents to vector database ...")
-        
-        if self.vectorstore is None:
-            # Create new vectorstore (Persists automatically in langchain-chroma)
-            self.vectorstore = Chroma.from_texts(
-                texts=texts, 
-                embedding=self.embeddings,
-                metadatas=metadatas,
-                persist_directory=self.persist_directory
+
+        # Skip chunks whose text was already embedded (re-uploads of the
+        # same PDF cost zero embedding compute)
+        texts, metadatas = self._filter_new_chunks(texts, metadatas)
+        if not texts:
+            print("All chunks already indexed, nothing to add.")
+            return
+
+        self.vectorstore.add_texts(
+            texts=texts,
+            metadatas=metadatas
+        )
+        self._maybe_promote_to_ivfpq()
+        self._save_index()
+        self._qcache.clear()   # new documents can change cached answers
+        print("Documents added successfully!")
+
+    def _maybe_promote_to_ivfpq(self):
+        """Swap the index for IVFPQ once the corpus is large enough."""
+        index = self.vectorstore.index
+        if index.ntotal < IVFPQ_PROMOTE_AT or isinstance(index, faiss.IndexIVFPQ):
+            return
+
+        print(f"Promoting index to IVFPQ ({index.ntotal} vectors) ...")
+        vectors = index.reconstruct_n(0, index.ntotal)
+
+        new_index = faiss.IndexIVFPQ(
+            faiss.IndexFlatIP(EMBEDDING_DIM),
+            EMBEDDING_DIM, IVFPQ_NLIST, IVFPQ_M, IVFPQ_NBITS
+        )
+        new_index.train(vectors[:IVFPQ_TRAIN_SAMPLE])
+        new_index.add(vectors)       # sequential ids, same as before the swap
+        new_index.nprobe = IVFPQ_NPROBE
+
+        self.vectorstore.index = new_index
+
+    def _filter_new_chunks(self, texts: list, metadatas: list = None):
+        """Drop chunks already recorded in the sidecar hash database."""
+        os.makedirs(self.persist_directory, exist_ok=True)
+        con = sqlite3.connect(os.path.join(self.persist_directory, "hashes.db"))
+        try:
+            con.execute("CREATE TABLE IF NOT EXISTS h(hash BLOB PRIMARY KEY)")
+
+            hashes = [hashlib.sha1(t.encode()).digest() for t in texts]
+
+            seen = set()
+            for i in range(0, len(hashes), 500):  # stay under SQLite's param limit
+                batch = hashes[i:i + 500]
+                marks = ",".join("?" * len(batch))
+                seen.update(
+                    row[0] for row in
+                    con.execute(f"SELECT hash FROM h WHERE hash IN ({marks})", batch)
+                )
+
+            keep = [i for i, h in enumerate(hashes) if h not in seen]
+            con.executemany(
+                "INSERT OR IGNORE INTO h VALUES (?)",
+                [(hashes[i],) for i in keep]
             )
-        else:
-            self.vectorstore.add_texts(
-                texts=texts,
-                metadatas=metadatas
+            con.commit()
+        finally:
+            con.close()
+
+        new_texts = [texts[i] for i in keep]
+        new_metadatas = [metadatas[i] for i in keep] if metadatas else None
+        return new_texts, new_metadatas
+
+    def _save_index(self):
+        os.makedirs(self.persist_directory, exist_ok=True)
+        faiss.write_index(
+            self.vectorstore.index,
+            os.path.join(self.persist_directory, "index.faiss")
+        )
+        # FAISS only stores the vectors, so keep the texts/metadata alongside
+        with open(os.path.join(self.persist_directory, "docstore.pkl"), "wb") as f:
+            pickle.dump(
+                (self.vectorstore.docstore._dict, self.vectorstore.index_to_docstore_id),
+                f
             )
-        print("Documents added successfully!")
-            
+
     def load_existing_database(self):
-        if os.path.exists(self.persist_directory):
-            self.vectorstore = Chroma(
-                persist_directory=self.persist_directory,
-                embedding_function=self.embeddings
+        index_path = os.path.join(self.persist_directory, "index.faiss")
+        store_path = os.path.join(self.persist_directory, "docstore.pkl")
+
+        if os.path.exists(index_path) and os.path.exists(store_path):
+            # Map the index file instead of loading it: vectors are paged
+            # in lazily by the kernel, so cold start is near-instant even
+            # for large corpora
+            try:
+                index = faiss.read_index(
+                    index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
+            except RuntimeError:
+                # some index types cannot be mmapped; load eagerly instead
+                index = faiss.read_index(index_path)
+            if isinstance(index, faiss.IndexHNSWFlat):
+                index.hnsw.efSearch = HNSW_EF_SEARCH
+
+            with open(store_path, "rb") as f:
+                docs, id_map = pickle.load(f)
+
+            self.vectorstore = FAISS(
+                embedding_function=self.embeddings,
+                index=index,
+                docstore=InMemoryDocstore(docs),
+                index_to_docstore_id=id_map
             )
             print("Loading existing database")
-            return True 
-        return False 
-    
-    def query(self, question: str, k: int = 4) -> dict:
-        """
-        Query the RAG system using the modern LCEL chain pattern.
-        """
-        if self.vectorstore is None:
-            return {"error": "No documents loaded. Please add documents first."}
-        
+            self._chains.clear()   # old chains hold retrievers on the old store
+            self._qcache.clear()
+            return True
+        return False
+
+    def _build_chain(self, k: int):
+        """Build the LCEL retrieval chain for a given retrieval depth."""
+
         # 1. Define the System Prompt
         system_prompt = (
             "You are an expert ESG report analyst. Use the following pieces of context from ESG reports to answer "
@@ -78,7 +224,7 @@ class RAGEngine:
             "information comes from.\n\n"
             "Context: {context}"
         )
-        
+
         # 2. Create the Chat Prompt Template
         prompt = ChatPromptTemplate.from_messages(
             [
@@ -86,28 +232,50 @@ class RAGEngine:
                 ("human", "{input}"),
             ]
         )
-        
+
         # 3. Create the 'Combine Documents' chain (the generation part)
         combine_docs_chain = create_stuff_documents_chain(self.llm, prompt)
-        
+
         # 4. Create the Retrieval Chain (combines retriever + generator)
         # Fix: 'retreiver' typo from original code corrected to 'retriever'
         retriever = self.vectorstore.as_retriever(search_kwargs={"k": k})
-        rag_chain = create_retrieval_chain(retriever, combine_docs_chain)
-        
-        # 5. Invoke the chain
+        return create_retrieval_chain(retriever, combine_docs_chain)
+
+    def query(self, question: str, k: int = 4) -> dict:
+        """
+        Query the RAG system using the modern LCEL chain pattern.
+        """
+        if self.vectorstore.index.ntotal == 0:
+            return {"error": "No documents loaded. Please add documents first."}
+
+        cache_key = (question, k)
+        cached = self._qcache.get(cache_key)
+        if cached is not None:
+            self._qcache.move_to_end(cache_key)
+            return cached
+
+        rag_chain = self._chains.get(k)
+        if rag_chain is None:
+            rag_chain = self._chains[k] = self._build_chain(k)
+
         result = rag_chain.invoke({"input": question})
-        
+
         # Return format consistent with your original code
-        return {
+        out = {
             "answer": result["answer"],
             "source_documents": result["context"]
         }
+
+        self._qcache[cache_key] = out
+        if len(self._qcache) > QUERY_CACHE_SIZE:
+            self._qcache.popitem(last=False)
+
+        return out
         
-    def similarity_search(self, query: str, k: int = 4) -> list:
-        if self.vectorstore is None:
+    def similarity_search(self, query: str, k: int = 4, filter: dict = None) -> list:
+        if self.vectorstore.index.ntotal == 0:
             return []
-        return self.vectorstore.similarity_search(query, k=k)
+        return self.vectorstore.similarity_search(query, k=k, filter=filter)
 
     
 # Test the RAG engine 
@@ -1,340 +1,827 @@
-import json
-
-class ESGScorer:
-    """Calculate ESG scores based on extracted metrics."""
-    
-    def __init__(self):
-        # Weights for different categories
-        self.weights = {
-            'environmental': 0.40,
-            'social': 0.30,
-            'governance': 0.30
-        }
-    
-    def score_environmental(self, metrics: dict) -> dict:
-        """Score environmental performance 0-10."""
-        score = 0
-        details = []
-        max_score = 10
-        
-        # Emissions reporting (2 points)
-        scope1 = metrics.get('scope_1_emissions')
-        scope2 = metrics.get('scope_2_emissions')
-        
-        if scope1 and scope1 is not None:
-            score += 1.5
-            details.append("✓ Reports Scope 1 emissions")
-        
-        if scope2 and scope2 is not None:
-            score += 0.5
-            details.append("✓ Reports Scope 2 emissions")
-        
-        if metrics.get('scope_3_emissions') and metrics.get('scope_3_emissions') is not None:
-            score += 1
-            details.append("✓ Reports Scope 3 emissions (comprehensive)")
-        
-        # Renewable energy (3 points)
-        renewable_pct = metrics.get('renewable_energy_percentage')
-        if renewable_pct is not None and renewable_pct > 0:
-            if renewable_pct >= 75:
-                score += 3
-                details.append(f"✓ Excellent renewable energy usage ({renewable_pct}%)")
-            elif renewable_pct >= 50:
-                score += 2.5
-                details.append(f"✓ Good renewable energy usage ({renewable_pct}%)")
-            elif renewable_pct >= 25:
-                score += 1.5
-                details.append(f"○ Moderate renewable energy usage ({renewable_pct}%)")
-            else:
-                score += 0.5
-                details.append(f"⚠ Low renewable energy usage ({renewable_pct}%)")
-        
-        # Waste management (1 point)
-        waste_pct = metrics.get('waste_recycled_percentage')
-        if waste_pct is not None and waste_pct > 0:
-            if waste_pct >= 75:
-                score += 1
-                details.append(f"✓ High waste diversion rate ({waste_pct}%)")
-            elif waste_pct >= 50:
-                score += 0.7
-                details.append(f"○ Moderate waste diversion ({waste_pct}%)")
-            elif waste_pct >= 25:
-                score += 0.4
-                details.append(f"⚠ Limited waste diversion ({waste_pct}%)")
-        
-        # Water efficiency (1 point) - if reported
-        if metrics.get('water_usage') and metrics.get('water_usage') is not None:
-            score += 0.5
-            details.append("✓ Reports water usage metrics")
-        
-        # Energy efficiency (1.5 points) - if reported
-        if metrics.get('energy_efficiency') and metrics.get('energy_efficiency') is not None:
-            score += 0.5
-            details.append("✓ Reports energy efficiency metrics")
-        
-        # Cap at max_score
-        score = min(score, max_score)
-        
-        return {
-            'score': round(score, 2),
-            'max_score': max_score,
-            'percentage': round((score / max_score) * 100, 1),
-            'details': details if details else ["⚠ Limited environmental data available"]
-        }
-    
-    def score_social(self, metrics: dict) -> dict:
-        """Score social performance 0-10."""
-        score = 0
-        details = []
-        max_score = 10
-        
-        # Gender diversity - workforce (2 points)
-        women_workforce = metrics.get('women_in_workforce_percentage')
-        if women_workforce is not None and women_workforce > 0:
-            if women_workforce >= 45:
-                score += 2
-                details.append(f"✓ Strong workforce diversity ({women_workforce}% women)")
-            elif women_workforce >= 35:
-                score += 1.5
-                details.append(f"○ Good workforce diversity ({women_workforce}% women)")
-            elif women_workforce >= 25:
-                score += 1
-                details.append(f"⚠ Improving workforce diversity ({women_workforce}% women)")
-            else:
-                score += 0.5
-                details.append(f"⚠ Limited workforce diversity ({women_workforce}% women)")
-        
-        # Gender diversity - leadership (3 points)
-        women_leadership = metrics.get('women_in_leadership_percentage')
-        if women_leadership is not None and women_leadership > 0:
-            if women_leadership >= 40:
-                score += 3
-                details.append(f"✓ Excellent leadership diversity ({women_leadership}% women)")
-            elif women_leadership >= 30:
-                score += 2
-                details.append(f"○ Good leadership diversity ({women_leadership}% women)")
-            elif women_leadership >= 20:
-                score += 1
-                details.append(f"⚠ Limited leadership diversity ({women_leadership}% women)")
-            else:
-                score += 0.5
-                details.append(f"⚠ Very limited leadership diversity ({women_leadership}% women)")
-        
-        # Board diversity (2 points)
-        board_diversity = metrics.get('board_diversity_percentage')
-        if board_diversity is not None and board_diversity > 0:
-            if board_diversity >= 40:
-                score += 2
-                details.append(f"✓ Strong board diversity ({board_diversity}%)")
-            elif board_diversity >= 30:
-                score += 1.5
-                details.append(f"○ Good board diversity ({board_diversity}%)")
-            elif board_diversity >= 20:
-                score += 1
-                details.append(f"⚠ Limited board diversity ({board_diversity}%)")
-            else:
-                score += 0.5
-                details.append(f"⚠ Very limited board diversity ({board_diversity}%)")
-        
-        # Safety metrics (2 points)
-        safety_rate = metrics.get('safety_incident_rate')
-        if safety_rate is not None:
-            if safety_rate < 1.0:
-                score += 2
-                details.append(f"✓ Excellent safety record ({safety_rate} incidents)")
-            elif safety_rate < 2.0:
-                score += 1.5
-                details.append(f"○ Good safety record ({safety_rate} incidents)")
-            elif safety_rate < 3.0:
-                score += 1
-                details.append(f"⚠ Moderate safety record ({safety_rate} incidents)")
-            else:
-                score += 0.5
-                details.append(f"⚠ Safety improvements needed ({safety_rate} incidents)")
-        
-        # Employee development (1 point)
-        training_hours = metrics.get('employee_training_hours')
-        if training_hours is not None and training_hours > 0:
-            if training_hours >= 40:
-                score += 1
-                details.append(f"✓ Strong employee development program ({training_hours} hrs)")
-            elif training_hours >= 20:
-                score += 0.7
-                details.append(f"○ Good employee development ({training_hours} hrs)")
-            else:
-                score += 0.4
-                details.append(f"⚠ Limited employee development ({training_hours} hrs)")
-        
-        score = min(score, max_score)
-        
-        return {
-            'score': round(score, 2),
-            'max_score': max_score,
-            'percentage': round((score / max_score) * 100, 1),
-            'details': details if details else ["⚠ Limited social data available"]
-        }
-    
-    def score_governance(self, metrics: dict) -> dict:
-        """Score governance performance 0-10."""
-        score = 0
-        details = []
-        max_score = 10
-        
-        # Board independence (3 points)
-        independent_pct = metrics.get('independent_directors_percentage')
-        if independent_pct is not None and independent_pct > 0:
-            if independent_pct >= 75:
-                score += 3
-                details.append(f"✓ Strong board independence ({independent_pct}%)")
-            elif independent_pct >= 50:
-                score += 2
-                details.append(f"○ Adequate board independence ({independent_pct}%)")
-            elif independent_pct > 0:
-                score += 1
-                details.append(f"⚠ Limited board independence ({independent_pct}%)")
-        
-        # ESG committee (2 points)
-        if metrics.get('esg_committee_exists') is True:
-            score += 2
-            details.append("✓ Dedicated ESG committee exists")
-        elif metrics.get('esg_committee_exists') is False:
-            score += 0.5
-            details.append("⚠ No dedicated ESG committee")
-        
-        # Board size (1 point) - optimal is 8-12 directors
-        board_size = metrics.get('board_size')
-        if board_size is not None and board_size > 0:
-            if 8 <= board_size <= 12:
-                score += 1
-                details.append(f"✓ Optimal board size ({board_size} directors)")
-            elif board_size > 0:
-                score += 0.5
-                details.append(f"○ Board size: {board_size} directors")
-        
-        # Ethics & compliance (4 points)
-        violations = metrics.get('ethics_violations_reported')
-        if violations is not None:
-            score += 2
-            details.append("✓ Transparent ethics reporting")
-            
-            if violations == 0:
-                score += 2
-                details.append("✓ No ethics violations reported")
-            elif violations < 5:
-                score += 1.5
-                details.append(f"○ Minimal violations ({violations})")
-            elif violations < 10:
-                score += 1
-                details.append(f"⚠ Some violations reported ({violations})")
-            else:
-                score += 0.5
-                details.append(f"⚠ Multiple violations reported ({violations})")
-        
-        # Climate risk disclosure (bonus points if available)
-        if metrics.get('climate_risk_disclosure'):
-            score += 0.5
-            details.append("✓ Climate risk disclosure included")
-        
-        score = min(score, max_score)
-        
-        return {
-            'score': round(score, 2),
-            'max_score': max_score,
-            'percentage': round((score / max_score) * 100, 1),
-            'details': details if details else ["⚠ Limited governance data available"]
-        }
-    
-    def calculate_overall_score(self, metrics: dict) -> dict:
-        """Calculate overall ESG score."""
-        
-        # Score each category
-        env_score = self.score_environmental(metrics.get('environmental', {}))
-        social_score = self.score_social(metrics.get('social', {}))
-        gov_score = self.score_governance(metrics.get('governance', {}))
-        
-        # Calculate weighted overall score
-        overall = (
-            env_score['score'] * self.weights['environmental'] +
-            social_score['score'] * self.weights['social'] +
-            gov_score['score'] * self.weights['governance']
-        )
-        
-        # Determine rating
-        if overall >= 8:
-            rating = "Excellent"
-            rating_emoji = "🌟"
-        elif overall >= 6.5:
-            rating = "Good"
-            rating_emoji = "✅"
-        elif overall >= 5:
-            rating = "Fair"
-            rating_emoji = "⚠️"
-        elif overall >= 3:
-            rating = "Needs Improvement"
-            rating_emoji = "⚠️"
-        else:
-            rating = "Limited Data"
-            rating_emoji = "❓"
-        
-        return {
-            'overall_score': round(overall, 2),
-            'max_score': 10,
-            'rating': rating,
-            'rating_emoji': rating_emoji,
-            'environmental': env_score,
-            'social': social_score,
-            'governance': gov_score,
-            'breakdown': {
-                'environmental': f"{env_score['score']}/10 ({self.weights['environmental']*100}% weight)",
-                'social': f"{social_score['score']}/10 ({self.weights['social']*100}% weight)",
-                'governance': f"{gov_score['score']}/10 ({self.weights['governance']*100}% weight)"
-            }
-        }
-
-# Test the scorer
-if __name__ == "__main__":
-    scorer = ESGScorer()
-    
-    # Test with sample metrics (including None values)
-    sample_metrics = {
-        'environmental': {
-            'scope_1_emissions': {'value': 200000, 'unit': 'tons CO2e', 'year': 2023},
-            'scope_2_emissions': {'value': 150000, 'unit': 'tons CO2e', 'year': 2023},
-            'scope_3_emissions': None,  # Testing None value
-            'renewable_energy_percentage': 78,
-            'waste_recycled_percentage': None  # Testing None value
-        },
-        'social': {
-            'women_in_workforce_percentage': 42,
-            'women_in_leadership_percentage': None,  # Testing None value
-            'board_diversity_percentage': 45,
-            'safety_incident_rate': 0.8,
-            'employee_training_hours': None  # Testing None value
-        },
-        'governance': {
-            'independent_directors_percentage': None,  # Testing None value
-            'board_size': 10,
-            'esg_committee_exists': True,
-            'ethics_violations_reported': 0
-        }
-    }
-    
-    result = scorer.calculate_overall_score(sample_metrics)
-    
-    print("ESG SCORE REPORT")
-    print("=" * 50)
-    print(f"Overall Score: {result['overall_score']}/10")
-    print(f"Rating: {result['rating']} {result['rating_emoji']}")
-    print()
-    print("Category Breakdown:")
-    print(f"  Environmental: {result['environmental']['score']}/10 ({result['environmental']['percentage']}%)")
-    print(f"  Social: {result['social']['score']}/10 ({result['social']['percentage']}%)")
-    print(f"  Governance: {result['governance']['score']}/10 ({result['governance']['percentage']}%)")
-    print()
-    print("Details:")
-    for category, data in [('Environmental', result['environmental']), 
-                           ('Social', result['social']), 
-                           ('Governance', result['governance'])]:
-        print(f"\n{category}:")
-        for detail in data['details']:
-            print(f"  {detail}")
\ No newline at end of file
+import json
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit, prange, set_num_threads
+    _HAS_NUMBA = True
+except ImportError:  # fall back to the interpreted version
+    _HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+# Threshold tables for the graded criteria. Each is (ascending thresholds,
+# score per bucket, detail template per bucket); bucket = bisect_right(...)
+# replaces the old if/elif ladders with one O(log n) lookup. A None
+# template means the bucket scores but adds no detail line.
+
+RENEWABLE_THRESH = (25, 50, 75)
+RENEWABLE_SCORES = (0.5, 1.5, 2.5, 3)
+RENEWABLE_TMPL = (
+    "⚠ Low renewable energy usage ({}%)",
+    "○ Moderate renewable energy usage ({}%)",
+    "✓ Good renewable energy usage ({}%)",
+    "✓ Excellent renewable energy usage ({}%)"
+)
+
+WASTE_THRESH = (25, 50, 75)
+WASTE_SCORES = (0, 0.4, 0.7, 1)
+WASTE_TMPL = (
+    None,
+    "⚠ Limited waste diversion ({}%)",
+    "○ Moderate waste diversion ({}%)",
+    "✓ High waste diversion rate ({}%)"
+)
+
+WOMEN_WORKFORCE_THRESH = (25, 35, 45)
+WOMEN_WORKFORCE_SCORES = (0.5, 1, 1.5, 2)
+WOMEN_WORKFORCE_TMPL = (
+    "⚠ Limited workforce diversity ({}% women)",
+    "⚠ Improving workforce diversity ({}% women)",
+    "○ Good workforce diversity ({}% women)",
+    "✓ Strong workforce diversity ({}% women)"
+)
+
+WOMEN_LEADERSHIP_THRESH = (20, 30, 40)
+WOMEN_LEADERSHIP_SCORES = (0.5, 1, 2, 3)
+WOMEN_LEADERSHIP_TMPL = (
+    "⚠ Very limited leadership diversity ({}% women)",
+    "⚠ Limited leadership diversity ({}% women)",
+    "○ Good leadership diversity ({}% women)",
+    "✓ Excellent leadership diversity ({}% women)"
+)
+
+BOARD_DIVERSITY_THRESH = (20, 30, 40)
+BOARD_DIVERSITY_SCORES = (0.5, 1, 1.5, 2)
+BOARD_DIVERSITY_TMPL = (
+    "⚠ Very limited board diversity ({}%)",
+    "⚠ Limited board diversity ({}%)",
+    "○ Good board diversity ({}%)",
+    "✓ Strong board diversity ({}%)"
+)
+
+# safety/violations are "lower is better": same bisect, descending scores
+SAFETY_THRESH = (1.0, 2.0, 3.0)
+SAFETY_SCORES = (2, 1.5, 1, 0.5)
+SAFETY_TMPL = (
+    "✓ Excellent safety record ({} incidents)",
+    "○ Good safety record ({} incidents)",
+    "⚠ Moderate safety record ({} incidents)",
+    "⚠ Safety improvements needed ({} incidents)"
+)
+
+TRAINING_THRESH = (20, 40)
+TRAINING_SCORES = (0.4, 0.7, 1)
+TRAINING_TMPL = (
+    "⚠ Limited employee development ({} hrs)",
+    "○ Good employee development ({} hrs)",
+    "✓ Strong employee development program ({} hrs)"
+)
+
+INDEPENDENT_THRESH = (50, 75)
+INDEPENDENT_SCORES = (1, 2, 3)
+INDEPENDENT_TMPL = (
+    "⚠ Limited board independence ({}%)",
+    "○ Adequate board independence ({}%)",
+    "✓ Strong board independence ({}%)"
+)
+
+VIOLATIONS_THRESH = (1, 5, 10)
+VIOLATIONS_SCORES = (2, 1.5, 1, 0.5)
+VIOLATIONS_TMPL = (
+    "✓ No ethics violations reported",
+    "○ Minimal violations ({})",
+    "⚠ Some violations reported ({})",
+    "⚠ Multiple violations reported ({})"
+)
+
+# Shared fallback detail lines: one flyweight list per category, built
+# at import instead of a fresh single-element list on every call
+_NO_ENV_DATA = ["⚠ Limited environmental data available"]
+_NO_SOC_DATA = ["⚠ Limited social data available"]
+_NO_GOV_DATA = ["⚠ Limited governance data available"]
+
+# Rating bands for the overall score: same bisect trick as the criteria
+_RATING_BOUNDS = (3, 5, 6.5, 8)
+_RATINGS = (
+    ("Limited Data", "❓"),
+    ("Needs Improvement", "⚠️"),
+    ("Fair", "⚠️"),
+    ("Good", "✅"),
+    ("Excellent", "🌟")
+)
+
+
+# Column layout of the packed (N, 17) batch matrix used by score_batch.
+# "Reported" metrics score on being present at all (any non-None value,
+# including zero); they pack to 1.0 when reported and NaN otherwise.
+# climate_risk_disclosure is a flag, so it packs on truthiness instead.
+# esg_committee_exists packs True/False to 1.0/0.0 and missing to NaN.
+_BATCH_KEYS = (
+    ('environmental', 'scope_1_emissions'),
+    ('environmental', 'scope_2_emissions'),
+    ('environmental', 'scope_3_emissions'),
+    ('environmental', 'renewable_energy_percentage'),
+    ('environmental', 'waste_recycled_percentage'),
+    ('environmental', 'water_usage'),
+    ('environmental', 'energy_efficiency'),
+    ('social', 'women_in_workforce_percentage'),
+    ('social', 'women_in_leadership_percentage'),
+    ('social', 'board_diversity_percentage'),
+    ('social', 'safety_incident_rate'),
+    ('social', 'employee_training_hours'),
+    ('governance', 'independent_directors_percentage'),
+    ('governance', 'esg_committee_exists'),
+    ('governance', 'board_size'),
+    ('governance', 'ethics_violations_reported'),
+    ('governance', 'climate_risk_disclosure'),
+)
+
+_REPORTED_KEYS = {
+    'scope_1_emissions', 'scope_2_emissions', 'scope_3_emissions',
+    'water_usage', 'energy_efficiency'
+}
+
+
+def _pack_batch(metrics_list):
+    """Stack a list of nested metric dicts into an (N, 17) float matrix."""
+    X = np.full((len(metrics_list), len(_BATCH_KEYS)), np.nan)
+    for i, metrics in enumerate(metrics_list):
+        for j, (category, key) in enumerate(_BATCH_KEYS):
+            value = (metrics.get(category) or {}).get(key)
+            if key in _REPORTED_KEYS:
+                if value is not None:
+                    X[i, j] = 1.0
+            elif key == 'climate_risk_disclosure':
+                if value:
+                    X[i, j] = 1.0
+            elif isinstance(value, bool):
+                X[i, j] = 1.0 if value else 0.0
+            elif isinstance(value, (int, float)):
+                X[i, j] = value
+    return X
+
+
+def _graded_np(col, thresholds, scores, positive_only=True):
+    """Vectorized _apply_threshold: bucket scores for a whole column."""
+    idx = np.searchsorted(thresholds, col, side='right')
+    with np.errstate(invalid='ignore'):
+        valid = ~np.isnan(col)
+        if positive_only:
+            valid &= col > 0
+    return np.where(valid, np.asarray(scores, dtype=np.float64)[idx], 0.0)
+
+
+# float64 copies of the threshold tables for the JIT kernel
+_REN_T, _REN_S = np.array(RENEWABLE_THRESH, np.float64), np.array(RENEWABLE_SCORES, np.float64)
+_WASTE_T, _WASTE_S = np.array(WASTE_THRESH, np.float64), np.array(WASTE_SCORES, np.float64)
+_WORK_T, _WORK_S = np.array(WOMEN_WORKFORCE_THRESH, np.float64), np.array(WOMEN_WORKFORCE_SCORES, np.float64)
+_LEAD_T, _LEAD_S = np.array(WOMEN_LEADERSHIP_THRESH, np.float64), np.array(WOMEN_LEADERSHIP_SCORES, np.float64)
+_BDIV_T, _BDIV_S = np.array(BOARD_DIVERSITY_THRESH, np.float64), np.array(BOARD_DIVERSITY_SCORES, np.float64)
+_SAFE_T, _SAFE_S = np.array(SAFETY_THRESH, np.float64), np.array(SAFETY_SCORES, np.float64)
+_TRAIN_T, _TRAIN_S = np.array(TRAINING_THRESH, np.float64), np.array(TRAINING_SCORES, np.float64)
+_INDEP_T, _INDEP_S = np.array(INDEPENDENT_THRESH, np.float64), np.array(INDEPENDENT_SCORES, np.float64)
+_VIOL_T, _VIOL_S = np.array(VIOLATIONS_THRESH, np.float64), np.array(VIOLATIONS_SCORES, np.float64)
+
+
+@njit(cache=True)
+def _graded_scalar(x, thresholds, scores, positive_only):
+    if np.isnan(x) or (positive_only and x <= 0):
+        return 0.0
+    i = 0
+    for t in thresholds:
+        if x >= t:
+            i += 1
+        else:
+            break
+    return scores[i]
+
+
+@njit(cache=True)
+def _score_numeric(v):
+    """
+    Numeric scoring kernel over a packed float64[17] vector in _BATCH_KEYS
+    order (NaN = missing). Returns (env, soc, gov); detail strings are the
+    caller's job. Numba compiles this to straight-line native code.
+    """
+    env = 0.0
+    if not np.isnan(v[0]):
+        env += 1.5
+    if not np.isnan(v[1]):
+        env += 0.5
+    if not np.isnan(v[2]):
+        env += 1.0
+    env += _graded_scalar(v[3], _REN_T, _REN_S, True)
+    env += _graded_scalar(v[4], _WASTE_T, _WASTE_S, True)
+    if not np.isnan(v[5]):
+        env += 0.5
+    if not np.isnan(v[6]):
+        env += 0.5
+    env = min(env, 10.0)
+
+    soc = (
+        _graded_scalar(v[7], _WORK_T, _WORK_S, True)
+        + _graded_scalar(v[8], _LEAD_T, _LEAD_S, True)
+        + _graded_scalar(v[9], _BDIV_T, _BDIV_S, True)
+        + _graded_scalar(v[10], _SAFE_T, _SAFE_S, False)
+        + _graded_scalar(v[11], _TRAIN_T, _TRAIN_S, True)
+    )
+    soc = min(soc, 10.0)
+
+    gov = _graded_scalar(v[12], _INDEP_T, _INDEP_S, True)
+    if v[13] == 1.0:
+        gov += 2.0
+    elif v[13] == 0.0:
+        gov += 0.5
+    if not np.isnan(v[14]) and v[14] > 0:
+        if 8 <= v[14] <= 12:
+            gov += 1.0
+        else:
+            gov += 0.5
+    if not np.isnan(v[15]):
+        gov += 2.0
+        gov += _graded_scalar(v[15], _VIOL_T, _VIOL_S, False)
+    if not np.isnan(v[16]):
+        gov += 0.5
+    gov = min(gov, 10.0)
+
+    return env, soc, gov
+
+
+class DetailsBuilder:
+    """
+    Detail lines recorded as strings or (template, value) pairs and
+    formatted only when iterated. Callers that just read the numeric
+    scores (batch comparisons, dashboards) never pay for str.format;
+    the strings are materialized once, on first use.
+    """
+    __slots__ = ('_items', '_strings')
+
+    def __init__(self):
+        self._items = []
+        self._strings = None
+
+    def append(self, item):
+        self._items.append(item)
+        self._strings = None
+
+    def extend(self, items):
+        self._items.extend(items)
+        self._strings = None
+
+    def tolist(self):
+        if self._strings is None:
+            self._strings = [
+                item if isinstance(item, str) else item[0].format(item[1])
+                for item in self._items
+            ]
+        return self._strings
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __eq__(self, other):
+        if isinstance(other, DetailsBuilder):
+            other = other.tolist()
+        return self.tolist() == other
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+
+@njit(cache=True, parallel=True)
+def _score_numeric_rows(X):
+    """Run _score_numeric over the rows of a packed matrix in parallel."""
+    out = np.empty((X.shape[0], 3))
+    for i in prange(X.shape[0]):
+        env, soc, gov = _score_numeric(X[i])
+        out[i, 0] = env
+        out[i, 1] = soc
+        out[i, 2] = gov
+    return out
+
+
+def _apply_threshold(value, thresholds, scores, templates, details):
+    """Look up the bucket for value and record its detail line."""
+    idx = bisect_right(thresholds, value)
+    template = templates[idx]
+    if template is not None:
+        details.append((template, value))
+    return scores[idx]
+
+
+def _centi(scores):
+    """Scale a score tuple to integer centi-points (0.5 -> 50)."""
+    return tuple(round(s * 100) for s in scores)
+
+
+# One scoring criterion, compiled once at scorer construction. `apply` is
+# the handler for the rule's kind, so scoring is a single loop over rules
+# with no per-call dispatch on rule type. Points are integer centi-points
+# (1.5 points -> 150) so the loop never touches float addition or round().
+Rule = namedtuple(
+    'Rule',
+    ['key', 'apply', 'points', 'points_alt', 'detail', 'detail_alt',
+     'thresholds', 'scores', 'templates', 'lo', 'hi'],
+    defaults=[0, 0, None, None, None, None, None, 0, 0]
+)
+
+
+def _rule_reported(rule, value, details):
+    """Points for reporting the metric at all (zero is still reported)."""
+    if value is not None:
+        details.append(rule.detail)
+        return rule.points
+    return 0
+
+
+def _rule_truthy(rule, value, details):
+    """Points only for a truthy value (e.g. a disclosure flag)."""
+    if value:
+        details.append(rule.detail)
+        return rule.points
+    return 0
+
+
+def _rule_graded(rule, value, details):
+    """Threshold table over a positive numeric metric."""
+    if value is not None and value > 0:
+        return _apply_threshold(value, rule.thresholds, rule.scores,
+                                rule.templates, details)
+    return 0
+
+
+def _rule_graded_any(rule, value, details):
+    """Threshold table where zero is a meaningful value (e.g. safety)."""
+    if value is not None:
+        return _apply_threshold(value, rule.thresholds, rule.scores,
+                                rule.templates, details)
+    return 0
+
+
+# Three-way committee flag decoded in a single lookup: value -> (centi-
+# points, detail line). Non-bool junk is routed to the None entry.
+_COMMITTEE_MAP = {
+    True: (200, "✓ Dedicated ESG committee exists"),
+    False: (50, "⚠ No dedicated ESG committee"),
+    None: (0, None),
+}
+
+
+def _rule_committee(rule, value, details):
+    points, detail = _COMMITTEE_MAP[value if isinstance(value, bool) else None]
+    if detail is not None:
+        details.append(detail)
+    return points
+
+
+def _rule_range(rule, value, details):
+    """Full points inside [lo, hi], consolation points otherwise."""
+    if value is not None and value > 0:
+        if rule.lo <= value <= rule.hi:
+            details.append((rule.detail, value))
+            return rule.points
+        details.append((rule.detail_alt, value))
+        return rule.points_alt
+    return 0
+
+
+def _rule_reported_graded(rule, value, details):
+    """Base points for reporting at all, plus a graded table on the value."""
+    if value is not None:
+        idx = bisect_right(rule.thresholds, value)
+        template = rule.templates[idx]
+        if template is not None:
+            details.extend((rule.detail, (template, value)))
+        else:
+            details.append(rule.detail)
+        return rule.points + rule.scores[idx]
+    return 0
+
+
+class ESGScorer:
+    """Calculate ESG scores based on extracted metrics."""
+
+    def __init__(self):
+        # Weights for different categories, frozen as plain attributes:
+        # the hot paths pay a LOAD_ATTR instead of a dict-hash probe.
+        # The weights dict API survives as a property below.
+        self.W_ENV, self.W_SOC, self.W_GOV = 0.40, 0.30, 0.30
+        self._weights_tuple = (self.W_ENV, self.W_SOC, self.W_GOV)
+
+        # Compile every criterion into a Rule once; the scoring methods
+        # are then a single generic loop. Rule order fixes detail order.
+        self._rules = {
+            'environmental': (
+                # Emissions reporting (2 points)
+                Rule('scope_1_emissions', _rule_reported, points=150,
+                     detail="✓ Reports Scope 1 emissions"),
+                Rule('scope_2_emissions', _rule_reported, points=50,
+                     detail="✓ Reports Scope 2 emissions"),
+                Rule('scope_3_emissions', _rule_reported, points=100,
+                     detail="✓ Reports Scope 3 emissions (comprehensive)"),
+                # Renewable energy (3 points)
+                Rule('renewable_energy_percentage', _rule_graded,
+                     thresholds=RENEWABLE_THRESH, scores=_centi(RENEWABLE_SCORES),
+                     templates=RENEWABLE_TMPL),
+                # Waste management (1 point)
+                Rule('waste_recycled_percentage', _rule_graded,
+                     thresholds=WASTE_THRESH, scores=_centi(WASTE_SCORES),
+                     templates=WASTE_TMPL),
+                # Water / energy efficiency - if reported
+                Rule('water_usage', _rule_reported, points=50,
+                     detail="✓ Reports water usage metrics"),
+                Rule('energy_efficiency', _rule_reported, points=50,
+                     detail="✓ Reports energy efficiency metrics"),
+            ),
+            'social': (
+                # Gender diversity - workforce (2 points)
+                Rule('women_in_workforce_percentage', _rule_graded,
+                     thresholds=WOMEN_WORKFORCE_THRESH, scores=_centi(WOMEN_WORKFORCE_SCORES),
+                     templates=WOMEN_WORKFORCE_TMPL),
+                # Gender diversity - leadership (3 points)
+                Rule('women_in_leadership_percentage', _rule_graded,
+                     thresholds=WOMEN_LEADERSHIP_THRESH, scores=_centi(WOMEN_LEADERSHIP_SCORES),
+                     templates=WOMEN_LEADERSHIP_TMPL),
+                # Board diversity (2 points)
+                Rule('board_diversity_percentage', _rule_graded,
+                     thresholds=BOARD_DIVERSITY_THRESH, scores=_centi(BOARD_DIVERSITY_SCORES),
+                     templates=BOARD_DIVERSITY_TMPL),
+                # Safety metrics (2 points) - zero incidents counts
+                Rule('safety_incident_rate', _rule_graded_any,
+                     thresholds=SAFETY_THRESH, scores=_centi(SAFETY_SCORES),
+                     templates=SAFETY_TMPL),
+                # Employee development (1 point)
+                Rule('employee_training_hours', _rule_graded,
+                     thresholds=TRAINING_THRESH, scores=_centi(TRAINING_SCORES),
+                     templates=TRAINING_TMPL),
+            ),
+            'governance': (
+                # Board independence (3 points)
+                Rule('independent_directors_percentage', _rule_graded,
+                     thresholds=INDEPENDENT_THRESH, scores=_centi(INDEPENDENT_SCORES),
+                     templates=INDEPENDENT_TMPL),
+                # ESG committee (2 points)
+                Rule('esg_committee_exists', _rule_committee),
+                # Board size (1 point) - optimal is 8-12 directors
+                Rule('board_size', _rule_range, points=100, points_alt=50,
+                     detail="✓ Optimal board size ({} directors)",
+                     detail_alt="○ Board size: {} directors",
+                     lo=8, hi=12),
+                # Ethics & compliance (4 points)
+                Rule('ethics_violations_reported', _rule_reported_graded, points=200,
+                     detail="✓ Transparent ethics reporting",
+                     thresholds=VIOLATIONS_THRESH, scores=_centi(VIOLATIONS_SCORES),
+                     templates=VIOLATIONS_TMPL),
+                # Climate risk disclosure (bonus points if available)
+                Rule('climate_risk_disclosure', _rule_truthy, points=50,
+                     detail="✓ Climate risk disclosure included"),
+            ),
+        }
+
+        # Rating scheme as data: band boundaries plus one (label, emoji)
+        # per band. An instance can swap in another scheme (e.g. MSCI
+        # letter bands) without touching the classifier code.
+        self._rating_bands = _RATING_BOUNDS
+        self._ratings = _RATINGS
+
+        # The weights are fixed for the life of the instance, so
+        # specialize the weighted sum once: generate a function with the
+        # weights baked in as literals, sparing three dict lookups and
+        # letting CPython fold the constants per call
+        ns = {}
+        exec(
+            "def _combine(e, s, g):\n"
+            "    return (e * {environmental!r} + s * {social!r}"
+            " + g * {governance!r})\n".format(**self.weights),
+            ns
+        )
+        self._combine = ns['_combine']
+
+        # Breakdown suffixes like "(40.0% weight)" never change after
+        # construction, so format them once instead of on every call
+        self._weight_suffix = {
+            k: f"({v * 100}% weight)" for k, v in self.weights.items()
+        }
+
+        # Per-instance memo of full scoring results, keyed on a canonical
+        # tuple of the metrics (per-instance because weights could differ)
+        self._score_cached = lru_cache(maxsize=1024)(self._score_canonical)
+
+    @property
+    def weights(self) -> dict:
+        """Category weights as a dict (kept for backward compatibility)."""
+        return {
+            'environmental': self.W_ENV,
+            'social': self.W_SOC,
+            'governance': self.W_GOV
+        }
+
+    def _score_category(self, rules: tuple, metrics: dict, empty_details: list) -> dict:
+        """Apply a compiled rule list to one category's metrics."""
+        # Pure integer accumulation in centi-points: no round() calls and
+        # no float-associativity drift; points are recovered by division
+        # only here, at the output boundary. Whole scores come back as
+        # ints so "7/10" still renders without a trailing .0.
+        score = 0
+        details = DetailsBuilder()
+
+        for rule in rules:
+            score += rule.apply(rule, metrics.get(rule.key), details)
+
+        score = min(score, 1000)
+
+        return {
+            'score': score // 100 if score % 100 == 0 else score / 100,
+            'max_score': 10,
+            'percentage': score / 10,
+            'details': details if details else empty_details
+        }
+
+    def score_environmental(self, metrics: dict) -> dict:
+        """Score environmental performance 0-10."""
+        return self._score_category(self._rules['environmental'], metrics,
+                                    _NO_ENV_DATA)
+
+    def score_social(self, metrics: dict) -> dict:
+        """Score social performance 0-10."""
+        return self._score_category(self._rules['social'], metrics,
+                                    _NO_SOC_DATA)
+
+    def score_governance(self, metrics: dict) -> dict:
+        """Score governance performance 0-10."""
+        return self._score_category(self._rules['governance'], metrics,
+                                    _NO_GOV_DATA)
+
+    def score_batch(self, metrics_list: list) -> dict:
+        """
+        Score many companies in one vectorized pass. Returns numpy arrays
+        (one entry per company); detail strings are skipped - use
+        calculate_overall_score for a per-company report.
+        """
+        X = _pack_batch(metrics_list)
+        (scope1, scope2, scope3, renewable, waste, water, energy,
+         workforce, leadership, board_div, safety, training,
+         independent, committee, board_size, violations, climate) = X.T
+
+        present = lambda col: np.where(np.isnan(col), 0.0, 1.0)
+
+        env = (
+            1.5 * present(scope1) + 0.5 * present(scope2) + 1.0 * present(scope3)
+            + _graded_np(renewable, RENEWABLE_THRESH, RENEWABLE_SCORES)
+            + _graded_np(waste, WASTE_THRESH, WASTE_SCORES)
+            + 0.5 * present(water) + 0.5 * present(energy)
+        )
+
+        soc = (
+            _graded_np(workforce, WOMEN_WORKFORCE_THRESH, WOMEN_WORKFORCE_SCORES)
+            + _graded_np(leadership, WOMEN_LEADERSHIP_THRESH, WOMEN_LEADERSHIP_SCORES)
+            + _graded_np(board_div, BOARD_DIVERSITY_THRESH, BOARD_DIVERSITY_SCORES)
+            + _graded_np(safety, SAFETY_THRESH, SAFETY_SCORES, positive_only=False)
+            + _graded_np(training, TRAINING_THRESH, TRAINING_SCORES)
+        )
+
+        with np.errstate(invalid='ignore'):
+            size_valid = ~np.isnan(board_size) & (board_size > 0)
+            size_optimal = size_valid & (board_size >= 8) & (board_size <= 12)
+
+        gov = (
+            _graded_np(independent, INDEPENDENT_THRESH, INDEPENDENT_SCORES)
+            + np.where(committee == 1.0, 2.0, np.where(committee == 0.0, 0.5, 0.0))
+            + np.where(size_optimal, 1.0, np.where(size_valid, 0.5, 0.0))
+            + np.where(np.isnan(violations), 0.0, 2.0)   # transparent reporting
+            + _graded_np(violations, VIOLATIONS_THRESH, VIOLATIONS_SCORES,
+                         positive_only=False)
+            + 0.5 * present(climate)
+        )
+
+        env = np.round(np.minimum(env, 10), 2)
+        soc = np.round(np.minimum(soc, 10), 2)
+        gov = np.round(np.minimum(gov, 10), 2)
+
+        overall = np.round(self._combine(env, soc, gov), 2)
+
+        labels = np.array([r[0] for r in self._ratings], dtype=object)
+        rating = labels[np.searchsorted(self._rating_bands, overall, side='right')]
+
+        return {
+            'environmental': env,
+            'social': soc,
+            'governance': gov,
+            'overall_score': overall,
+            'rating': rating
+        }
+
+    def score_batch_parallel(self, metrics_list: list, workers: int = None) -> dict:
+        """
+        score_batch fanned out across cores: the JIT kernel scores one
+        company per prange iteration, with no cross-row state. Without
+        numba the single-core vectorized path is the fastest we have,
+        so fall back to it.
+        """
+        if not _HAS_NUMBA:
+            return self.score_batch(metrics_list)
+
+        if workers is not None:
+            set_num_threads(workers)
+
+        scores = _score_numeric_rows(_pack_batch(metrics_list))
+        env = np.round(scores[:, 0], 2)
+        soc = np.round(scores[:, 1], 2)
+        gov = np.round(scores[:, 2], 2)
+        overall = np.round(self._combine(env, soc, gov), 2)
+
+        labels = np.array([r[0] for r in self._ratings], dtype=object)
+        rating = labels[np.searchsorted(self._rating_bands, overall, side='right')]
+
+        return {
+            'environmental': env,
+            'social': soc,
+            'governance': gov,
+            'overall_score': overall,
+            'rating': rating
+        }
+
+    def calculate_overall_score_fast(self, metrics: dict) -> dict:
+        """
+        Numbers-only variant of calculate_overall_score for bulk loops:
+        runs the JIT kernel and formats nothing but the rating.
+        """
+        env, soc, gov = _score_numeric(_pack_batch([metrics])[0])
+        env, soc, gov = round(env, 2), round(soc, 2), round(gov, 2)
+
+        overall = round(self._combine(env, soc, gov), 2)
+
+        rating = self._ratings[bisect_right(self._rating_bands, overall)][0]
+
+        return {
+            'overall_score': overall,
+            'rating': rating,
+            'environmental': env,
+            'social': soc,
+            'governance': gov
+        }
+
+    @staticmethod
+    def _canon(value):
+        """Freeze a nested metrics dict into a hashable canonical tuple."""
+        if isinstance(value, dict):
+            return ('d', tuple(sorted(
+                (k, ESGScorer._canon(v)) for k, v in value.items()
+            )))
+        if isinstance(value, (list, tuple)):
+            return ('l', tuple(ESGScorer._canon(v) for v in value))
+        return value
+
+    @staticmethod
+    def _uncanon(value):
+        """Inverse of _canon."""
+        if isinstance(value, tuple) and len(value) == 2 and value[0] in ('d', 'l'):
+            if value[0] == 'd':
+                return {k: ESGScorer._uncanon(v) for k, v in value[1]}
+            return [ESGScorer._uncanon(v) for v in value[1]]
+        return value
+
+    def _score_canonical(self, canon_key):
+        return self._score_uncached(self._uncanon(canon_key))
+
+    def calculate_overall_score(self, metrics: dict,
+                                detail_level: str = 'full') -> dict:
+        """
+        Calculate overall ESG score (memoized on the metrics content).
+
+        detail_level controls how much of the result is built: 'overall'
+        returns just {'overall_score', 'rating'}, 'categories' adds the
+        numeric per-category scores, and 'full' (the default) includes
+        the detail lines and breakdown strings as well. The reduced
+        levels run the numeric kernel and skip every per-category dict,
+        detail list and format call.
+        """
+        if detail_level != 'full':
+            result = self.calculate_overall_score_fast(metrics)
+            if detail_level == 'overall':
+                return {
+                    'overall_score': result['overall_score'],
+                    'rating': result['rating']
+                }
+            return result
+
+        # UI re-renders and comparison views re-score identical metrics;
+        # a cache hit replaces the whole scoring pass with a dict lookup
+        try:
+            return self._score_cached(self._canon(metrics))
+        except TypeError:  # unhashable leaf somewhere - score directly
+            return self._score_uncached(metrics)
+
+    def cache_info(self):
+        """Hit/miss stats for the scoring cache (for tuning maxsize)."""
+        return self._score_cached.cache_info()
+
+    def cache_clear(self):
+        self._score_cached.cache_clear()
+
+    def _score_uncached(self, metrics: dict) -> dict:
+        """Calculate overall ESG score."""
+
+        # Score each category
+        env_score = self.score_environmental(metrics.get('environmental', {}))
+        social_score = self.score_social(metrics.get('social', {}))
+        gov_score = self.score_governance(metrics.get('governance', {}))
+
+        # Calculate weighted overall score
+        overall = self._combine(
+            env_score['score'], social_score['score'], gov_score['score']
+        )
+
+        # Determine rating
+        rating, rating_emoji = self._ratings[
+            bisect_right(self._rating_bands, overall)
+        ]
+
+        return {
+            'overall_score': round(overall, 2),
+            'max_score': 10,
+            'rating': rating,
+            'rating_emoji': rating_emoji,
+            'environmental': env_score,
+            'social': social_score,
+            'governance': gov_score,
+            'breakdown': {
+                'environmental': f"{env_score['score']}/10 {self._weight_suffix['environmental']}",
+                'social': f"{social_score['score']}/10 {self._weight_suffix['social']}",
+                'governance': f"{gov_score['score']}/10 {self._weight_suffix['governance']}"
+            }
+        }
+
+
+# Lazy module-level scorer for callers on the default weights: the
+# compiled rules, specialized combiner and result cache are built once
+# and shared. Safe across threads - scoring never mutates the instance.
+_DEFAULT_SCORER = None
+
+
+def get_default_scorer() -> ESGScorer:
+    """Return the shared default-weights scorer, building it on first use."""
+    global _DEFAULT_SCORER
+    if _DEFAULT_SCORER is None:
+        _DEFAULT_SCORER = ESGScorer()
+    return _DEFAULT_SCORER
+
+
+# Test the scorer
+if __name__ == "__main__":
+    scorer = ESGScorer()
+
+    # Test with sample metrics (including None values)
+    sample_metrics = {
+        'environmental': {
+            'scope_1_emissions': {'value': 200000, 'unit': 'tons CO2e', 'year': 2023},
+            'scope_2_emissions': {'value': 150000, 'unit': 'tons CO2e', 'year': 2023},
+            'scope_3_emissions': None,  # Testing None value
+            'renewable_energy_percentage': 78,
+            'waste_recycled_percentage': None  # Testing None value
+        },
+        'social': {
+            'women_in_workforce_percentage': 42,
+            'women_in_leadership_percentage': None,  # Testing None value
+            'board_diversity_percentage': 45,
+            'safety_incident_rate': 0.8,
+            'employee_training_hours': None  # Testing None value
+        },
+        'governance': {
+            'independent_directors_percentage': None,  # Testing None value
+            'board_size': 10,
+            'esg_committee_exists': True,
+            'ethics_violations_reported': 0
+        }
+    }
+
+    result = scorer.calculate_overall_score(sample_metrics)
+
+    print("ESG SCORE REPORT")
+    print("=" * 50)
+    print(f"Overall Score: {result['overall_score']}/10")
+    print(f"Rating: {result['rating']} {result['rating_emoji']}")
+    print()
+    print("Category Breakdown:")
+    print(f"  Environmental: {result['environmental']['score']}/10 ({result['environmental']['percentage']}%)")
+    print(f"  Social: {result['social']['score']}/10 ({result['social']['percentage']}%)")
+    print(f"  Governance: {result['governance']['score']}/10 ({result['governance']['percentage']}%)")
+    print()
+    print("Details:")
+    for category, data in [('Environmental', result['environmental']),
+                           ('Social', result['social']),
+                           ('Governance', result['governance'])]:
+        print(f"\n{category}:")
+        for detail in data['details']:
+            print(f"  {detail}")